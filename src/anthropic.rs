@@ -1,6 +1,7 @@
 use anyhow::Result;
 use futures_util::StreamExt;
 use log::{debug, error};
+use reqwest::header::{HeaderMap, HeaderValue};
 use reqwest::Client;
 use serde::{Deserialize, Serialize};
 use serde_json::Value;
@@ -122,16 +123,34 @@ pub struct Usage {
 
 pub struct AnthropicClient {
     client: Client,
-    api_key: String,
-    base_url: String,
+    default_headers: HeaderMap,
+    endpoints: Vec<String>,
 }
 
 impl AnthropicClient {
     pub fn new(api_key: String, base_url: String) -> Self {
+        // The candidate endpoints depend only on the base URL, so build them
+        // once here instead of re-formatting them for every message
+        let endpoints = vec![
+            format!("{}/v1/messages", base_url),
+            format!("{}/messages", base_url),
+            format!("{}/anthropic/v1/messages", base_url),
+        ];
+
+        // Every request sends the same three headers; parse and validate them
+        // once here so each call just clones the prebuilt map
+        let mut default_headers = HeaderMap::new();
+        default_headers.insert(
+            "x-api-key",
+            HeaderValue::from_str(&api_key).unwrap_or_else(|_| HeaderValue::from_static("")),
+        );
+        default_headers.insert("anthropic-version", HeaderValue::from_static("2023-06-01"));
+        default_headers.insert("content-type", HeaderValue::from_static("application/json"));
+
         Self {
-            client: Client::new(),
-            api_key,
-            base_url,
+            client: crate::llm::shared_http_client(),
+            default_headers,
+            endpoints,
         }
     }
 
@@ -145,51 +164,38 @@ impl AnthropicClient {
         system_prompt: Option<&String>,
         cancellation_flag: Arc<AtomicBool>,
     ) -> Result<AnthropicResponse> {
-        // Try the standard endpoint first, then fall back to alternatives if needed
-        let endpoints = vec![
-            format!("{}/v1/messages", self.base_url),
-            format!("{}/messages", self.base_url),
-            format!("{}/anthropic/v1/messages", self.base_url),
-        ];
+        // Build the request body once up front; falling back to another
+        // endpoint reuses it instead of re-cloning the whole conversation
+        // and tool definitions per attempt
+        let request = Self::build_request(
+            model,
+            messages,
+            tools,
+            max_tokens,
+            temperature,
+            system_prompt,
+            false,
+        );
 
-        for endpoint in endpoints.iter() {
+        // Try the standard endpoint first, then fall back to alternatives if needed
+        let mut last_error = None;
+        for endpoint in self.endpoints.iter() {
             match self
-                .try_endpoint(
-                    endpoint,
-                    model,
-                    &messages,
-                    tools,
-                    max_tokens,
-                    temperature,
-                    system_prompt,
-                    cancellation_flag.clone(),
-                )
+                .try_endpoint(endpoint, &request, cancellation_flag.clone())
                 .await
             {
                 Ok(response) => {
                     return Ok(response);
                 }
-                Err(_) => {
-                    // Continue to the next endpoint
-                    continue;
+                Err(e) => {
+                    // Keep the error and continue to the next endpoint
+                    last_error = Some(e);
                 }
             }
         }
 
         // If all endpoints failed, return the error from the last attempt
-        let last_endpoint = &endpoints[endpoints.len() - 1];
-        return self
-            .try_endpoint(
-                last_endpoint,
-                model,
-                &messages,
-                tools,
-                max_tokens,
-                temperature,
-                system_prompt,
-                cancellation_flag.clone(),
-            )
-            .await;
+        Err(last_error.unwrap_or_else(|| anyhow::anyhow!("No API endpoints configured")))
     }
 
     pub async fn create_message_stream(
@@ -203,23 +209,24 @@ impl AnthropicClient {
         on_content: Arc<dyn Fn(String) + Send + Sync + 'static>,
         cancellation_flag: Arc<AtomicBool>,
     ) -> Result<AnthropicResponse> {
-        // Try the standard endpoint first, then fall back to alternatives if needed
-        let endpoints = vec![
-            format!("{}/v1/messages", self.base_url),
-            format!("{}/messages", self.base_url),
-            format!("{}/anthropic/v1/messages", self.base_url),
-        ];
+        // Build the request body once up front, as in create_message
+        let request = Self::build_request(
+            model,
+            messages,
+            tools,
+            max_tokens,
+            temperature,
+            system_prompt,
+            true,
+        );
 
-        for endpoint in endpoints.iter() {
+        // Try the standard endpoint first, then fall back to alternatives if needed
+        let mut last_error = None;
+        for endpoint in self.endpoints.iter() {
             match self
                 .try_endpoint_stream(
                     endpoint,
-                    model,
-                    &messages,
-                    tools,
-                    max_tokens,
-                    temperature,
-                    system_prompt,
+                    &request,
                     on_content.clone(),
                     cancellation_flag.clone(),
                 )
@@ -228,41 +235,26 @@ impl AnthropicClient {
                 Ok(response) => {
                     return Ok(response);
                 }
-                Err(_) => {
-                    // Continue to the next endpoint
-                    continue;
+                Err(e) => {
+                    // Keep the error and continue to the next endpoint
+                    last_error = Some(e);
                 }
             }
         }
 
         // If all endpoints failed, return the error from the last attempt
-        let last_endpoint = &endpoints[endpoints.len() - 1];
-        return self
-            .try_endpoint_stream(
-                last_endpoint,
-                model,
-                &messages,
-                tools,
-                max_tokens,
-                temperature,
-                system_prompt,
-                on_content.clone(),
-                cancellation_flag.clone(),
-            )
-            .await;
+        Err(last_error.unwrap_or_else(|| anyhow::anyhow!("No API endpoints configured")))
     }
 
-    async fn try_endpoint(
-        &self,
-        endpoint: &str,
+    fn build_request(
         model: &str,
-        messages: &[Message],
+        messages: Vec<Message>,
         tools: &[Tool],
         max_tokens: u32,
         temperature: f32,
         system_prompt: Option<&String>,
-        cancellation_flag: Arc<AtomicBool>,
-    ) -> Result<AnthropicResponse> {
+        stream: bool,
+    ) -> AnthropicRequest {
         let tool_definitions = if tools.is_empty() {
             None
         } else {
@@ -278,21 +270,28 @@ impl AnthropicClient {
             )
         };
 
-        let request = AnthropicRequest {
+        AnthropicRequest {
             model: model.to_string(),
             max_tokens,
             temperature,
-            messages: messages.to_vec(),
+            messages,
             tools: tool_definitions,
-            stream: Some(false),
+            stream: Some(stream),
             system: system_prompt.cloned(),
-        };
+        }
+    }
 
+    async fn try_endpoint(
+        &self,
+        endpoint: &str,
+        request: &AnthropicRequest,
+        cancellation_flag: Arc<AtomicBool>,
+    ) -> Result<AnthropicResponse> {
         // Log outgoing request (debug level only)
         debug!("Sending API request to endpoint: {}", endpoint);
-        debug!("Request body: {}", serde_json::to_string_pretty(&request)?);
-        debug!("Sending message to model: {}", model);
-        if let Some(system_prompt) = system_prompt {
+        debug!("Request body: {}", serde_json::to_string_pretty(request)?);
+        debug!("Sending message to model: {}", request.model);
+        if let Some(system_prompt) = &request.system {
             debug!("Using system prompt: {}", system_prompt);
         }
 
@@ -304,9 +303,7 @@ impl AnthropicClient {
         let response = self
             .client
             .post(endpoint)
-            .header("x-api-key", &self.api_key)
-            .header("anthropic-version", "2023-06-01")
-            .header("content-type", "application/json")
+            .headers(self.default_headers.clone())
             .json(&request)
             .send()
             .await?;
@@ -317,21 +314,22 @@ impl AnthropicClient {
             error!("API Request Failed:");
             error!("  Endpoint: {}", endpoint);
             error!("  Status: {}", status);
-            error!("  Model: {}", model);
+            error!("  Model: {}", request.model);
             error!("  Error Response: {}", error_text);
             error!("  Request headers: x-api-key=[REDACTED], anthropic-version=2023-06-01");
             return Err(anyhow::anyhow!("API error: {} - {}", status, error_text));
         }
 
-        // Get the response text
-        let response_text = response.text().await?;
+        // Get the raw response body; deserializing straight from the bytes
+        // skips the UTF-8 validation pass and string copy that text() does
+        let response_bytes = response.bytes().await?;
 
         // Log incoming response (debug level only)
         debug!("Received API response with status: {}", status);
-        debug!("Response body: {}", response_text);
+        debug!("Response body: {}", String::from_utf8_lossy(&response_bytes));
 
         // Try to parse the response
-        match serde_json::from_str::<AnthropicResponse>(&response_text) {
+        match serde_json::from_slice::<AnthropicResponse>(&response_bytes) {
             Ok(anthropic_response) => {
                 debug!("Successfully received response from API");
                 if let Some(usage) = &anthropic_response.usage {
@@ -344,7 +342,7 @@ impl AnthropicClient {
             }
             Err(e) => {
                 // Try to parse as a generic JSON to handle error responses
-                match serde_json::from_str::<serde_json::Value>(&response_text) {
+                match serde_json::from_slice::<serde_json::Value>(&response_bytes) {
                     Ok(value) => {
                         // Check if this is an error response with specific fields
                         if let (Some(code), Some(msg), Some(success)) = (
@@ -371,44 +369,14 @@ impl AnthropicClient {
     async fn try_endpoint_stream(
         &self,
         endpoint: &str,
-        model: &str,
-        messages: &[Message],
-        tools: &[Tool],
-        max_tokens: u32,
-        temperature: f32,
-        system_prompt: Option<&String>,
+        request: &AnthropicRequest,
         on_content: Arc<dyn Fn(String) + Send + Sync + 'static>,
         cancellation_flag: Arc<AtomicBool>,
     ) -> Result<AnthropicResponse> {
-        let tool_definitions = if tools.is_empty() {
-            None
-        } else {
-            Some(
-                tools
-                    .iter()
-                    .map(|t| ToolDefinition {
-                        name: t.name.clone(),
-                        description: t.description.clone(),
-                        input_schema: t.input_schema.clone(),
-                    })
-                    .collect(),
-            )
-        };
-
-        let request = AnthropicRequest {
-            model: model.to_string(),
-            max_tokens,
-            temperature,
-            messages: messages.to_vec(),
-            tools: tool_definitions,
-            stream: Some(true),
-            system: system_prompt.cloned(),
-        };
-
         // Log outgoing streaming request (debug level only)
         debug!("Sending streaming API request to endpoint: {}", endpoint);
-        debug!("Request body: {}", serde_json::to_string_pretty(&request)?);
-        if let Some(system_prompt) = system_prompt {
+        debug!("Request body: {}", serde_json::to_string_pretty(request)?);
+        if let Some(system_prompt) = &request.system {
             debug!("Using system prompt: {}", system_prompt);
         }
 
@@ -420,9 +388,7 @@ impl AnthropicClient {
         let response = self
             .client
             .post(endpoint)
-            .header("x-api-key", &self.api_key)
-            .header("anthropic-version", "2023-06-01")
-            .header("content-type", "application/json")
+            .headers(self.default_headers.clone())
             .json(&request)
             .send()
             .await?;
@@ -433,14 +399,14 @@ impl AnthropicClient {
             error!("API Request Failed:");
             error!("  Endpoint: {}", endpoint);
             error!("  Status: {}", status);
-            error!("  Model: {}", model);
+            error!("  Model: {}", request.model);
             error!("  Error Response: {}", error_text);
             error!("  Request headers: x-api-key=[REDACTED], anthropic-version=2023-06-01");
             return Err(anyhow::anyhow!("API error: {} - {}", status, error_text));
         }
 
         // Process the streaming response
-        let mut buffer = String::new();
+        let mut buffer: Vec<u8> = Vec::new();
         let mut content_blocks = Vec::new();
         let mut current_content = String::new();
         let mut usage_info = None;
@@ -456,179 +422,183 @@ impl AnthropicClient {
 
             match chunk_result {
                 Ok(chunk) => {
-                    if let Ok(chunk_str) = std::str::from_utf8(&chunk) {
-                        debug!("Received chunk: {}", chunk_str);
-                        buffer.push_str(chunk_str);
-
-                        // Process complete SSE events
-                        while let Some(event_start) = buffer.find("data: ") {
-                            if let Some(event_end) = buffer[event_start..].find("\n\n") {
-                                let event_end = event_start + event_end + 2;
-                                let event_data = &buffer[event_start + 6..event_end - 2]; // Skip "data: " and trailing "\n\n"
-
-                                debug!("Parsed SSE event: {}", event_data);
-
-                                if event_data.trim() == "[DONE]" {
-                                    break;
-                                }
+                    debug!("Received chunk: {}", String::from_utf8_lossy(&chunk));
+                    buffer.extend_from_slice(&chunk);
+
+                    // Process complete SSE events straight from the byte
+                    // buffer: chunk boundaries can split a multi-byte
+                    // character, and serde parses from a byte slice directly,
+                    // so validating UTF-8 per chunk was both an extra pass
+                    // over the body and a way to silently drop data.
+                    while let Some(event_start) = find_subslice(&buffer, b"data: ") {
+                        if let Some(event_end) = find_subslice(&buffer[event_start..], b"\n\n") {
+                            let event_end = event_start + event_end + 2;
+                            let event_data = &buffer[event_start + 6..event_end - 2]; // Skip "data: " and trailing "\n\n"
+
+                            debug!("Parsed SSE event: {}", String::from_utf8_lossy(event_data));
+
+                            if event_data.trim_ascii() == b"[DONE]" {
+                                break;
+                            }
 
-                                if let Ok(event) = serde_json::from_str::<StreamEvent>(event_data) {
-                                    debug!(
-                                        "Received stream event: type={}, delta={:?}",
-                                        event.event_type, event.delta
-                                    );
-                                    match event.event_type.as_str() {
-                                        "content_block_start" => {
-                                            debug!("Starting new content block");
-                                            if let Some(content_block) = event.content_block {
-                                                debug!(
-                                                    "Content block from event: {:?}",
-                                                    content_block
-                                                );
-                                                match content_block.block_type.as_str() {
-                                                    "text" => {
-                                                        current_content.clear();
-                                                    }
+                            if let Ok(event) = serde_json::from_slice::<StreamEvent>(event_data) {
+                                debug!(
+                                    "Received stream event: type={}, delta={:?}",
+                                    event.event_type, event.delta
+                                );
+                                match event.event_type.as_str() {
+                                    "content_block_start" => {
+                                        debug!("Starting new content block");
+                                        if let Some(content_block) = event.content_block {
+                                            debug!(
+                                                "Content block from event: {:?}",
+                                                content_block
+                                            );
+                                            match content_block.block_type.as_str() {
+                                                "text" => {
+                                                    current_content.clear();
+                                                }
+                                                "tool_use" => {
+                                                    debug!(
+                                                        "Setting tool_use block: {:?}",
+                                                        content_block
+                                                    );
+                                                    current_tool_block = Some(content_block);
+                                                }
+                                                _ => {
+                                                    debug!(
+                                                        "Unknown block type: {}",
+                                                        content_block.block_type
+                                                    );
+                                                }
+                                            }
+                                        } else if let Some(delta) = event.delta {
+                                            // Handle tool_use blocks from delta
+                                            debug!("Delta in content_block_start: {:?}", delta);
+                                            if let Some(block_type) = delta.delta_type {
+                                                match block_type.as_str() {
                                                     "tool_use" => {
-                                                        debug!(
-                                                            "Setting tool_use block: {:?}",
-                                                            content_block
-                                                        );
-                                                        current_tool_block = Some(content_block);
+                                                        debug!("Creating tool_use block from delta: id={:?}, name={:?}", delta.id, delta.name);
+                                                        current_tool_block =
+                                                            Some(ContentBlock {
+                                                                block_type: "tool_use"
+                                                                    .to_string(),
+                                                                text: None,
+                                                                id: delta.id,
+                                                                name: delta.name,
+                                                                input: None,
+                                                                tool_use_id: None,
+                                                                content: None,
+                                                                is_error: None,
+                                                            });
                                                     }
                                                     _ => {
                                                         debug!(
-                                                            "Unknown block type: {}",
-                                                            content_block.block_type
+                                                            "Unknown delta block type: {}",
+                                                            block_type
                                                         );
                                                     }
                                                 }
-                                            } else if let Some(delta) = event.delta {
-                                                // Handle tool_use blocks from delta
-                                                debug!("Delta in content_block_start: {:?}", delta);
-                                                if let Some(block_type) = delta.delta_type {
-                                                    match block_type.as_str() {
-                                                        "tool_use" => {
-                                                            debug!("Creating tool_use block from delta: id={:?}, name={:?}", delta.id, delta.name);
-                                                            current_tool_block =
-                                                                Some(ContentBlock {
-                                                                    block_type: "tool_use"
-                                                                        .to_string(),
-                                                                    text: None,
-                                                                    id: delta.id,
-                                                                    name: delta.name,
-                                                                    input: None,
-                                                                    tool_use_id: None,
-                                                                    content: None,
-                                                                    is_error: None,
-                                                                });
-                                                        }
-                                                        _ => {
-                                                            debug!(
-                                                                "Unknown delta block type: {}",
-                                                                block_type
-                                                            );
-                                                        }
-                                                    }
-                                                }
                                             }
                                         }
-                                        "content_block_delta" => {
-                                            if let Some(delta) = event.delta {
-                                                if let Some(text) = delta.text {
-                                                    if current_tool_block.is_some() {
-                                                        // We're in a tool_use block, but got text - this shouldn't happen
-                                                        debug!("Unexpected text in tool_use block");
-                                                    } else {
-                                                        // Regular text content
-                                                        current_content.push_str(&text);
-                                                        on_content.as_ref()(text.clone());
-                                                    }
-                                                } else if let Some(partial_json) =
-                                                    delta.partial_json
+                                    }
+                                    "content_block_delta" => {
+                                        if let Some(delta) = event.delta {
+                                            if let Some(text) = delta.text {
+                                                if current_tool_block.is_some() {
+                                                    // We're in a tool_use block, but got text - this shouldn't happen
+                                                    debug!("Unexpected text in tool_use block");
+                                                } else {
+                                                    // Regular text content
+                                                    current_content.push_str(&text);
+                                                    on_content.as_ref()(text.clone());
+                                                }
+                                            } else if let Some(partial_json) =
+                                                delta.partial_json
+                                            {
+                                                // Handle tool input JSON
+                                                debug!(
+                                                    "Received partial_json: {}",
+                                                    partial_json
+                                                );
+                                                if let Some(ref mut tool_block) =
+                                                    current_tool_block
                                                 {
-                                                    // Handle tool input JSON
-                                                    debug!(
-                                                        "Received partial_json: {}",
-                                                        partial_json
-                                                    );
-                                                    if let Some(ref mut tool_block) =
-                                                        current_tool_block
+                                                    if let Some(Value::String(mut existing)) =
+                                                        tool_block.input.take()
                                                     {
-                                                        if let Some(Value::String(mut existing)) =
-                                                            tool_block.input.take()
-                                                        {
-                                                            // Append to existing JSON string
-                                                            existing.push_str(&partial_json);
-                                                            debug!(
-                                                                "Appending to existing JSON: {}",
-                                                                existing
-                                                            );
-                                                            tool_block.input =
-                                                                Some(Value::String(existing));
-                                                        } else {
-                                                            // Start new JSON string (replace any existing non-string or create new)
-                                                            debug!(
-                                                                "Starting new JSON string: {}",
-                                                                partial_json
-                                                            );
-                                                            tool_block.input =
-                                                                Some(Value::String(partial_json));
-                                                        }
+                                                        // Append to existing JSON string
+                                                        existing.push_str(&partial_json);
+                                                        debug!(
+                                                            "Appending to existing JSON: {}",
+                                                            existing
+                                                        );
+                                                        tool_block.input =
+                                                            Some(Value::String(existing));
+                                                    } else {
+                                                        // Start new JSON string (replace any existing non-string or create new)
+                                                        debug!(
+                                                            "Starting new JSON string: {}",
+                                                            partial_json
+                                                        );
+                                                        tool_block.input =
+                                                            Some(Value::String(partial_json));
                                                     }
                                                 }
                                             }
                                         }
-                                        "content_block_stop" => {
-                                            if let Some(mut tool_block) = current_tool_block.take()
+                                    }
+                                    "content_block_stop" => {
+                                        if let Some(mut tool_block) = current_tool_block.take()
+                                        {
+                                            debug!("Finalizing tool block: {:?}", tool_block);
+                                            // Finalize tool_use block
+                                            // Parse the accumulated JSON string into a proper JSON value
+                                            if let Some(Value::String(ref json_str)) =
+                                                tool_block.input
                                             {
-                                                debug!("Finalizing tool block: {:?}", tool_block);
-                                                // Finalize tool_use block
-                                                // Parse the accumulated JSON string into a proper JSON value
-                                                if let Some(Value::String(ref json_str)) =
-                                                    tool_block.input
-                                                {
-                                                    debug!("Parsing JSON string: {}", json_str);
-                                                    match serde_json::from_str::<Value>(&json_str) {
-                                                        Ok(parsed_json) => {
-                                                            debug!(
-                                                                "Successfully parsed JSON: {:?}",
-                                                                parsed_json
-                                                            );
-                                                            tool_block.input = Some(parsed_json);
-                                                        }
-                                                        Err(e) => {
-                                                            debug!("Failed to parse tool JSON: {}, keeping as string", e);
-                                                            // Keep as string if parsing fails
-                                                        }
+                                                debug!("Parsing JSON string: {}", json_str);
+                                                match serde_json::from_str::<Value>(&json_str) {
+                                                    Ok(parsed_json) => {
+                                                        debug!(
+                                                            "Successfully parsed JSON: {:?}",
+                                                            parsed_json
+                                                        );
+                                                        tool_block.input = Some(parsed_json);
+                                                    }
+                                                    Err(e) => {
+                                                        debug!("Failed to parse tool JSON: {}, keeping as string", e);
+                                                        // Keep as string if parsing fails
                                                     }
                                                 }
-                                                debug!("Finalized tool block: {:?}", tool_block);
-                                                content_blocks.push(tool_block);
-                                            } else if !current_content.is_empty() {
-                                                content_blocks.push(ContentBlock::text(
-                                                    current_content.clone(),
-                                                ));
-                                                current_content.clear();
                                             }
-                                        }
-                                        "message_stop" => {
-                                            debug!("Stream ended");
-                                        }
-                                        _ => {
-                                            debug!("Unknown event type: {}", event.event_type);
+                                            debug!("Finalized tool block: {:?}", tool_block);
+                                            content_blocks.push(tool_block);
+                                        } else if !current_content.is_empty() {
+                                            content_blocks.push(ContentBlock::text(
+                                                current_content.clone(),
+                                            ));
+                                            current_content.clear();
                                         }
                                     }
-
-                                    if let Some(usage) = event.usage {
-                                        usage_info = Some(usage);
+                                    "message_stop" => {
+                                        debug!("Stream ended");
+                                    }
+                                    _ => {
+                                        debug!("Unknown event type: {}", event.event_type);
                                     }
                                 }
 
-                                buffer = buffer[event_end..].to_string();
-                            } else {
-                                break; // Incomplete event, wait for more data
+                                if let Some(usage) = event.usage {
+                                    usage_info = Some(usage);
+                                }
                             }
+
+                            // Shift the consumed event out in place instead of
+                            // reallocating the remaining buffer for every event
+                            buffer.drain(..event_end);
+                        } else {
+                            break; // Incomplete event, wait for more data
                         }
                     }
                 }
@@ -684,3 +654,11 @@ impl AnthropicClient {
             .join("\n")
     }
 }
+
+/// Locate `needle` within `haystack`, returning the byte offset of the first
+/// match. Used for SSE framing on the raw response bytes.
+fn find_subslice(haystack: &[u8], needle: &[u8]) -> Option<usize> {
+    haystack
+        .windows(needle.len())
+        .position(|window| window == needle)
+}
@@ -2,6 +2,7 @@ use anyhow::Result;
 use colored::*;
 use regex::Regex;
 use std::io::{self, Write};
+use std::sync::OnceLock;
 
 pub struct CodeFormatter {
     code_block_regex: Regex,
@@ -163,12 +164,12 @@ impl CodeFormatter {
             "crate", "super", "self", "Self", "where", "async", "await", "move", "ref", "unsafe",
             "extern",
         ];
-        for keyword in &keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().blue().to_string())
-                .to_string();
-        }
+        static KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&KEYWORD_REGEX, &keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().blue().to_string()
+            })
+            .to_string();
 
         // Types
         let types = [
@@ -176,15 +177,16 @@ impl CodeFormatter {
             "i8", "i16", "i32", "i64", "i128", "u8", "u16", "u32", "u64", "u128", "f32", "f64",
             "bool", "char",
         ];
-        for type_name in &types {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(type_name))).unwrap();
-            result = regex
-                .replace_all(&result, type_name.bold().cyan().to_string())
-                .to_string();
-        }
+        static TYPE_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&TYPE_REGEX, &types)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().cyan().to_string()
+            })
+            .to_string();
 
         // Strings
-        let string_regex = Regex::new(r#""([^"\\]|\\.)*""#).unwrap();
+        static STRING_REGEX: OnceLock<Regex> = OnceLock::new();
+        let string_regex = cached_regex(&STRING_REGEX, r#""([^"\\]|\\.)*""#);
         result = string_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!("\"{}\"", &caps[0][1..caps[0].len() - 1].green())
@@ -212,17 +214,16 @@ impl CodeFormatter {
             "is", "None", "True", "False", "pass", "break", "continue", "global", "nonlocal",
             "async", "await",
         ];
-        for keyword in &keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().blue().to_string())
-                .to_string();
-        }
+        static KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&KEYWORD_REGEX, &keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().blue().to_string()
+            })
+            .to_string();
 
         // Strings
-        let string_regex =
-            Regex::new(r#"'([^'\\]|\\.)*'|"""([^"\\]|\\.)*"""|"([^"\\]|\\.)*"|"""([^"\\]|\\.)*"""#)
-                .unwrap();
+        static STRING_REGEX: OnceLock<Regex> = OnceLock::new();
+        let string_regex = cached_regex(&STRING_REGEX, r#"'([^'\\]|\\.)*'|"""([^"\\]|\\.)*"""|"([^"\\]|\\.)*"|"""([^"\\]|\\.)*"""#);
         result = string_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 caps[0].green().to_string()
@@ -281,16 +282,16 @@ impl CodeFormatter {
             "from",
             "default",
         ];
-        for keyword in &keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().blue().to_string())
-                .to_string();
-        }
+        static KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&KEYWORD_REGEX, &keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().blue().to_string()
+            })
+            .to_string();
 
         // Strings
-        let string_regex =
-            Regex::new(r#"'([^'\\]|\\.)*'|"(?:"([^"\\]|\\.)*")|`([^`\\]|\\.)*`"#).unwrap();
+        static STRING_REGEX: OnceLock<Regex> = OnceLock::new();
+        let string_regex = cached_regex(&STRING_REGEX, r#"'([^'\\]|\\.)*'|"(?:"([^"\\]|\\.)*")|`([^`\\]|\\.)*`"#);
         result = string_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 caps[0].green().to_string()
@@ -331,12 +332,12 @@ impl CodeFormatter {
             "never",
             "any",
         ];
-        for keyword in &ts_keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().magenta().to_string())
-                .to_string();
-        }
+        static TS_KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&TS_KEYWORD_REGEX, &ts_keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().magenta().to_string()
+            })
+            .to_string();
 
         result
     }
@@ -345,7 +346,8 @@ impl CodeFormatter {
         let mut result = line.to_string();
 
         // JSON keys (strings before colons)
-        let key_regex = Regex::new(r#""([^"\\]|\\.)*"\s*:"#).unwrap();
+        static KEY_REGEX: OnceLock<Regex> = OnceLock::new();
+        let key_regex = cached_regex(&KEY_REGEX, r#""([^"\\]|\\.)*"\s*:"#);
         result = key_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 let key_part = &caps[0][..caps[0].len() - 1];
@@ -354,7 +356,8 @@ impl CodeFormatter {
             .to_string();
 
         // JSON string values
-        let string_regex = Regex::new(r#":\s*"([^"\\]|\\.)*""#).unwrap();
+        static STRING_REGEX: OnceLock<Regex> = OnceLock::new();
+        let string_regex = cached_regex(&STRING_REGEX, r#":\s*"([^"\\]|\\.)*""#);
         result = string_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!(": {}", &caps[0][2..].green())
@@ -362,7 +365,8 @@ impl CodeFormatter {
             .to_string();
 
         // JSON numbers and booleans
-        let value_regex = Regex::new(r":\s*(true|false|null|\d+\.?\d*)").unwrap();
+        static VALUE_REGEX: OnceLock<Regex> = OnceLock::new();
+        let value_regex = cached_regex(&VALUE_REGEX, r":\s*(true|false|null|\d+\.?\d*)");
         result = value_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!(": {}", &caps[0][2..].yellow())
@@ -382,7 +386,8 @@ impl CodeFormatter {
         }
 
         // YAML string values
-        let string_regex = Regex::new(r#":\s*["'][^"']*["']"#).unwrap();
+        static STRING_REGEX: OnceLock<Regex> = OnceLock::new();
+        let string_regex = cached_regex(&STRING_REGEX, r#":\s*["'][^"']*["']"#);
         result = string_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!(": {}", &caps[0][2..].green())
@@ -390,7 +395,8 @@ impl CodeFormatter {
             .to_string();
 
         // YAML numbers and booleans
-        let value_regex = Regex::new(r":\s*(true|false|null|\d+\.?\d*)").unwrap();
+        static VALUE_REGEX: OnceLock<Regex> = OnceLock::new();
+        let value_regex = cached_regex(&VALUE_REGEX, r":\s*(true|false|null|\d+\.?\d*)");
         result = value_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!(": {}", &caps[0][2..].yellow())
@@ -404,13 +410,15 @@ impl CodeFormatter {
         let mut result = self.highlight_numbers(line);
 
         // HTML tags
-        let tag_regex = Regex::new(r"</?[^>]+>").unwrap();
+        static TAG_REGEX: OnceLock<Regex> = OnceLock::new();
+        let tag_regex = cached_regex(&TAG_REGEX, r"</?[^>]+>");
         result = tag_regex
             .replace_all(&result, |caps: &regex::Captures| caps[0].blue().to_string())
             .to_string();
 
         // HTML attributes
-        let attr_regex = Regex::new(r#"(\w+)=["'][^"']*["']"#).unwrap();
+        static ATTR_REGEX: OnceLock<Regex> = OnceLock::new();
+        let attr_regex = cached_regex(&ATTR_REGEX, r#"(\w+)=["'][^"']*["']"#);
         result = attr_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!("{}={}", caps[1].cyan(), &caps[0][caps[1].len()..].green())
@@ -424,7 +432,8 @@ impl CodeFormatter {
         let mut result = self.highlight_numbers(line);
 
         // CSS selectors and properties
-        let selector_regex = Regex::new(r"[.#]?[\w-]+\s*\{").unwrap();
+        static SELECTOR_REGEX: OnceLock<Regex> = OnceLock::new();
+        let selector_regex = cached_regex(&SELECTOR_REGEX, r"[.#]?[\w-]+\s*\{");
         result = selector_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 caps[0].bold().blue().to_string()
@@ -432,13 +441,15 @@ impl CodeFormatter {
             .to_string();
 
         // CSS properties
-        let prop_regex = Regex::new(r"[\w-]+:").unwrap();
+        static PROP_REGEX: OnceLock<Regex> = OnceLock::new();
+        let prop_regex = cached_regex(&PROP_REGEX, r"[\w-]+:");
         result = prop_regex
             .replace_all(&result, |caps: &regex::Captures| caps[0].cyan().to_string())
             .to_string();
 
         // CSS values
-        let value_regex = Regex::new(r":\s*[^;]+;?").unwrap();
+        static VALUE_REGEX: OnceLock<Regex> = OnceLock::new();
+        let value_regex = cached_regex(&VALUE_REGEX, r":\s*[^;]+;?");
         result = value_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!(": {}", &caps[0][2..].green())
@@ -462,15 +473,16 @@ impl CodeFormatter {
             "tar", "gzip", "gunzip", "zip", "unzip", "ssh", "scp", "rsync", "git", "make", "gcc",
             "g++", "python", "python3", "node", "npm", "yarn", "docker", "kubectl",
         ];
-        for command in &commands {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(command))).unwrap();
-            result = regex
-                .replace_all(&result, command.bold().green().to_string())
-                .to_string();
-        }
+        static COMMAND_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&COMMAND_REGEX, &commands)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().green().to_string()
+            })
+            .to_string();
 
         // Strings
-        let string_regex = Regex::new(r#"'([^'\\]|\\.)*'|"(?:[^"\\]|\\.)*""#).unwrap();
+        static STRING_REGEX: OnceLock<Regex> = OnceLock::new();
+        let string_regex = cached_regex(&STRING_REGEX, r#"'([^'\\]|\\.)*'|"(?:[^"\\]|\\.)*""#);
         result = string_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 caps[0].yellow().to_string()
@@ -551,15 +563,16 @@ impl CodeFormatter {
             "TRY_CAST",
             "TRY_CONVERT",
         ];
-        for keyword in &keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().blue().to_string())
-                .to_string();
-        }
+        static KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&KEYWORD_REGEX, &keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().blue().to_string()
+            })
+            .to_string();
 
         // SQL identifiers (backticks, brackets, quotes)
-        let ident_regex = Regex::new(r#"[`'"\[\]]([^`'"\[\]]*)[`'"\[\]]"#).unwrap();
+        static IDENT_REGEX: OnceLock<Regex> = OnceLock::new();
+        let ident_regex = cached_regex(&IDENT_REGEX, r#"[`'"\[\]]([^`'"\[\]]*)[`'"\[\]]"#);
         result = ident_regex
             .replace_all(&result, |caps: &regex::Captures| caps[0].cyan().to_string())
             .to_string();
@@ -582,13 +595,15 @@ impl CodeFormatter {
         }
 
         // Bold text
-        let bold_regex = Regex::new(r"\*\*([^*]+)\*\*").unwrap();
+        static BOLD_REGEX: OnceLock<Regex> = OnceLock::new();
+        let bold_regex = cached_regex(&BOLD_REGEX, r"\*\*([^*]+)\*\*");
         result = bold_regex
             .replace_all(&result, |caps: &regex::Captures| caps[0].bold().to_string())
             .to_string();
 
         // Italic text
-        let italic_regex = Regex::new(r"\*([^*]+)\*").unwrap();
+        static ITALIC_REGEX: OnceLock<Regex> = OnceLock::new();
+        let italic_regex = cached_regex(&ITALIC_REGEX, r"\*([^*]+)\*");
         result = italic_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 caps[0].italic().to_string()
@@ -596,7 +611,8 @@ impl CodeFormatter {
             .to_string();
 
         // Code inline
-        let code_regex = Regex::new(r"`([^`]+)`").unwrap();
+        static CODE_REGEX: OnceLock<Regex> = OnceLock::new();
+        let code_regex = cached_regex(&CODE_REGEX, r"`([^`]+)`");
         result = code_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!("`{}`", caps[1].black().on_white())
@@ -604,7 +620,8 @@ impl CodeFormatter {
             .to_string();
 
         // Links
-        let link_regex = Regex::new(r"\[([^\]]+)\]\(([^)]+)\)").unwrap();
+        static LINK_REGEX: OnceLock<Regex> = OnceLock::new();
+        let link_regex = cached_regex(&LINK_REGEX, r"\[([^\]]+)\]\(([^)]+)\)");
         result = link_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 format!("[{}]({})", caps[1].blue().underline(), caps[2].dimmed())
@@ -629,7 +646,8 @@ impl CodeFormatter {
         }
 
         // TOML strings
-        let string_regex = Regex::new(r#"="([^"\\]|\\.)*"|'([^'\\]|\\.)*'"#).unwrap();
+        static STRING_REGEX: OnceLock<Regex> = OnceLock::new();
+        let string_regex = cached_regex(&STRING_REGEX, r#"="([^"\\]|\\.)*"|'([^'\\]|\\.)*'"#);
         result = string_regex
             .replace_all(&result, |caps: &regex::Captures| {
                 caps[0].green().to_string()
@@ -701,12 +719,12 @@ impl CodeFormatter {
             "template",
             "typename",
         ];
-        for keyword in &keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().blue().to_string())
-                .to_string();
-        }
+        static KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&KEYWORD_REGEX, &keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().blue().to_string()
+            })
+            .to_string();
 
         // Preprocessor directives
         if result.starts_with('#') {
@@ -771,12 +789,12 @@ impl CodeFormatter {
             "enum",
             "assert",
         ];
-        for keyword in &keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().blue().to_string())
-                .to_string();
-        }
+        static KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&KEYWORD_REGEX, &keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().blue().to_string()
+            })
+            .to_string();
 
         // Annotations
         if result.starts_with('@') {
@@ -817,12 +835,12 @@ impl CodeFormatter {
             "type",
             "var",
         ];
-        for keyword in &keywords {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(keyword))).unwrap();
-            result = regex
-                .replace_all(&result, keyword.bold().blue().to_string())
-                .to_string();
-        }
+        static KEYWORD_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&KEYWORD_REGEX, &keywords)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().blue().to_string()
+            })
+            .to_string();
 
         // Go types
         let types = [
@@ -845,12 +863,12 @@ impl CodeFormatter {
             "byte",
             "rune",
         ];
-        for type_name in &types {
-            let regex = Regex::new(&format!(r"\b{}\b", regex::escape(type_name))).unwrap();
-            result = regex
-                .replace_all(&result, type_name.bold().cyan().to_string())
-                .to_string();
-        }
+        static TYPE_REGEX: OnceLock<Regex> = OnceLock::new();
+        result = keyword_regex(&TYPE_REGEX, &types)
+            .replace_all(&result, |caps: &regex::Captures| {
+                caps[0].bold().cyan().to_string()
+            })
+            .to_string();
 
         result
     }
@@ -914,6 +932,29 @@ impl CodeFormatter {
     }
 }
 
+/// Compile a pattern once on first use and cache it for the life of the
+/// process. The highlighters run per line, so recompiling here is pure waste.
+fn cached_regex(cell: &'static OnceLock<Regex>, pattern: &str) -> &'static Regex {
+    cell.get_or_init(|| Regex::new(pattern).unwrap())
+}
+
+/// Build a `\b(?:word1|word2|...)\b` alternation for a keyword set once.
+/// Compiling one regex per keyword per line dominated formatting time for
+/// large code blocks; a single cached alternation scans each line once.
+fn keyword_regex(cell: &'static OnceLock<Regex>, words: &[&str]) -> &'static Regex {
+    cell.get_or_init(|| {
+        let pattern = format!(
+            r"\b(?:{})\b",
+            words
+                .iter()
+                .map(|word| regex::escape(word))
+                .collect::<Vec<_>>()
+                .join("|")
+        );
+        Regex::new(&pattern).unwrap()
+    })
+}
+
 pub fn create_code_formatter() -> Result<CodeFormatter> {
     CodeFormatter::new()
 }
@@ -953,76 +994,85 @@ impl StreamingResponseFormatter {
 
         self.pending_line.push_str(chunk);
 
+        // Compose everything this chunk produces into one buffer so a chunk
+        // spanning many lines costs one write + flush instead of a locked
+        // println! (and its syscall) per line.
+        let mut out = String::new();
         while let Some(pos) = self.pending_line.find('\n') {
             let line = self.pending_line[..pos].to_string();
             self.pending_line.drain(..=pos);
-            self.process_complete_line(line.trim_end_matches('\r'))?;
+            self.process_complete_line(line.trim_end_matches('\r'), &mut out);
         }
 
-        io::stdout().flush()?;
+        if !out.is_empty() {
+            let mut stdout = io::stdout().lock();
+            stdout.write_all(out.as_bytes())?;
+            stdout.flush()?;
+        }
         Ok(())
     }
 
     pub fn finish(&mut self) -> Result<()> {
+        let mut out = String::new();
+
         if !self.pending_line.is_empty() {
             if self.in_code_block {
                 let highlighted = self
                     .formatter
                     .highlight_line(&self.pending_line, &self.current_lang);
-                println!("{}", highlighted);
+                out.push_str(&highlighted);
+                out.push('\n');
             } else {
-                print!("{}", self.pending_line);
+                out.push_str(&self.pending_line);
             }
             self.pending_line.clear();
         }
 
         if self.in_code_block {
-            println!(
-                "{}",
-                self.formatter.build_code_block_footer(&self.current_lang)
-            );
+            out.push_str(&self.formatter.build_code_block_footer(&self.current_lang));
+            out.push('\n');
             self.in_code_block = false;
         }
 
-        io::stdout().flush()?;
+        let mut stdout = io::stdout().lock();
+        stdout.write_all(out.as_bytes())?;
+        stdout.flush()?;
         Ok(())
     }
 
-    fn process_complete_line(&mut self, line: &str) -> Result<()> {
+    fn process_complete_line(&mut self, line: &str, out: &mut String) {
         if self.in_code_block {
-            self.handle_code_line(line);
+            self.handle_code_line(line, out);
         } else {
-            self.handle_plain_line(line)?;
+            self.handle_plain_line(line, out);
         }
-        Ok(())
     }
 
-    fn handle_plain_line(&mut self, line: &str) -> Result<()> {
+    fn handle_plain_line(&mut self, line: &str, out: &mut String) {
         let trimmed = line.trim_start();
         if trimmed.starts_with("```") {
             let lang = trimmed.trim_start_matches("```").trim();
-            self.start_code_block(lang);
+            self.start_code_block(lang, out);
         } else {
-            println!("{}", line);
+            out.push_str(line);
+            out.push('\n');
         }
-        Ok(())
     }
 
-    fn handle_code_line(&mut self, line: &str) {
+    fn handle_code_line(&mut self, line: &str, out: &mut String) {
         if line.trim() == "```" {
-            println!(
-                "{}",
-                self.formatter.build_code_block_footer(&self.current_lang)
-            );
+            out.push_str(&self.formatter.build_code_block_footer(&self.current_lang));
+            out.push('\n');
             self.in_code_block = false;
             return;
         }
 
         let highlighted = self.formatter.highlight_line(line, &self.current_lang);
-        println!("{}", highlighted);
+        out.push_str(&highlighted);
+        out.push('\n');
     }
 
-    fn start_code_block(&mut self, lang: &str) {
+    fn start_code_block(&mut self, lang: &str, out: &mut String) {
         let normalized = self.formatter.normalize_language(lang);
         let language = if normalized.is_empty() {
             "text"
@@ -1030,7 +1080,8 @@ impl StreamingResponseFormatter {
             normalized
         };
         self.current_lang = language.to_string();
-        println!("{}", self.formatter.build_code_block_header(language));
+        out.push_str(&self.formatter.build_code_block_header(language));
+        out.push('\n');
         self.in_code_block = true;
     }
 }
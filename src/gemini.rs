@@ -97,16 +97,19 @@ struct GeminiResponse {
 
 pub struct GeminiClient {
     client: Client,
-    api_key: String,
-    base_url: String,
+    endpoint_prefix: String,
+    endpoint_suffix: String,
 }
 
 impl GeminiClient {
     pub fn new(api_key: String, base_url: String) -> Self {
+        // Everything around the model name in the endpoint URL is constant,
+        // so encode it once here; per-call URL building is then a plain
+        // three-part concatenation
         Self {
-            client: Client::new(),
-            api_key,
-            base_url: base_url.trim_end_matches('/').to_string(),
+            client: crate::llm::shared_http_client(),
+            endpoint_prefix: format!("{}/models/", base_url.trim_end_matches('/')),
+            endpoint_suffix: format!(":generateContent?key={}", api_key),
         }
     }
 
@@ -132,10 +135,7 @@ impl GeminiClient {
             system_prompt,
         );
 
-        let endpoint = format!(
-            "{}/models/{}:generateContent?key={}",
-            self.base_url, model, self.api_key
-        );
+        let endpoint = format!("{}{}{}", self.endpoint_prefix, model, self.endpoint_suffix);
 
         debug!("Sending Gemini request to {}", endpoint);
         let response = self
@@ -146,9 +146,12 @@ impl GeminiClient {
             .await?;
 
         let status = response.status();
-        let response_text = response.text().await?;
+        // Keep the body as bytes and parse it in place; the success path
+        // never needs the String copy, and the error path decodes lazily
+        let response_bytes = response.bytes().await?;
 
         if !status.is_success() {
+            let response_text = String::from_utf8_lossy(&response_bytes);
             error!("Gemini request failed: {}", status);
             error!("Response: {}", response_text);
             return Err(anyhow::anyhow!(
@@ -158,8 +161,8 @@ impl GeminiClient {
             ));
         }
 
-        debug!("Gemini raw response: {}", response_text);
-        let parsed: GeminiResponse = serde_json::from_str(&response_text).map_err(|e| {
+        debug!("Gemini raw response: {}", String::from_utf8_lossy(&response_bytes));
+        let parsed: GeminiResponse = serde_json::from_slice(&response_bytes).map_err(|e| {
             error!("Failed to parse Gemini response: {}", e);
             e
         })?;
@@ -3,12 +3,48 @@ use crate::config::Provider;
 use crate::gemini::GeminiClient;
 use crate::tools::{Tool, ToolCall};
 use anyhow::Result;
+use reqwest::Client;
 use serde_json::Value;
 use std::sync::Arc;
 use std::sync::atomic::AtomicBool;
+use std::sync::OnceLock;
+use std::time::Duration;
 
 pub type LlmResponse = AnthropicResponse;
 
+/// Shared HTTP client used by all providers.
+///
+/// Reusing one client pools TCP+TLS connections across requests, so repeated
+/// calls to the same API host skip the DNS lookup and handshake instead of
+/// paying for them on every message. Cloning a `reqwest::Client` is cheap
+/// (it's an `Arc` internally), so each provider can hold its own handle.
+pub fn shared_http_client() -> Client {
+    static CLIENT: OnceLock<Client> = OnceLock::new();
+    CLIENT
+        .get_or_init(|| {
+            Client::builder()
+                .pool_max_idle_per_host(50)
+                .pool_idle_timeout(Duration::from_secs(90))
+                // Small JSON request bodies suffer from Nagle + delayed-ACK
+                // interaction, which can add tens of milliseconds per request;
+                // disable Nagle and keep pooled sockets alive so idle
+                // connections aren't silently dropped by middleboxes.
+                .tcp_nodelay(true)
+                .tcp_keepalive(Duration::from_secs(60))
+                // The API hosts speak HTTP/2; keep the multiplexed connection
+                // warm between messages with protocol-level pings (which also
+                // survive NATs better than TCP keepalive alone) and let the
+                // flow-control window grow with observed bandwidth so large
+                // streaming responses aren't throttled by the default window.
+                .http2_keep_alive_interval(Duration::from_secs(30))
+                .http2_keep_alive_while_idle(true)
+                .http2_adaptive_window(true)
+                .build()
+                .unwrap_or_else(|_| Client::new())
+        })
+        .clone()
+}
+
 pub struct LlmClient {
     provider: Provider,
     anthropic: Option<AnthropicClient>,
@@ -241,22 +241,30 @@ impl McpConnection {
         let mut reader = self.reader.take().unwrap();
 
         tokio::spawn(async move {
-            let mut buffer = String::new();
+            // Read raw byte lines and hand them straight to serde; read_line
+            // would validate the UTF-8 of every line (and bail on invalid
+            // bytes) before the parser validates it again
+            let mut buffer = Vec::new();
             loop {
-                match reader.read_line(&mut buffer).await {
+                buffer.clear();
+                match reader.read_until(b'\n', &mut buffer).await {
                     Ok(0) => {
                         debug!("MCP server {} closed connection", name);
                         break;
                     }
                     Ok(_) => {
-                        if buffer.trim().is_empty() {
-                            buffer.clear();
+                        let line = buffer.trim_ascii();
+                        if line.is_empty() {
                             continue;
                         }
 
-                        debug!("Received from MCP server {}: {}", name, buffer.trim());
+                        debug!(
+                            "Received from MCP server {}: {}",
+                            name,
+                            String::from_utf8_lossy(line)
+                        );
 
-                        match serde_json::from_str::<McpResponse>(&buffer.trim()) {
+                        match serde_json::from_slice::<McpResponse>(line) {
                             Ok(response) => {
                                 if let Some(id) = &response.id {
                                     let mut pending = pending_requests.lock().await;
@@ -334,7 +342,7 @@ impl McpConnection {
                                     "Failed to parse MCP response from {}: {}. Response: {}",
                                     name,
                                     e,
-                                    buffer.trim()
+                                    String::from_utf8_lossy(line)
                                 );
                                 error!(
                                     "MCP server '{}' sent invalid JSON data. This may indicate:",
@@ -345,10 +353,12 @@ impl McpConnection {
                                     "2. Server process is crashing or outputting error messages"
                                 );
                                 error!("3. Version mismatch between client and server");
-                                debug!("Raw response that failed to parse: {}", buffer.trim());
+                                debug!(
+                                    "Raw response that failed to parse: {}",
+                                    String::from_utf8_lossy(line)
+                                );
                             }
                         }
-                        buffer.clear();
                     }
                     Err(e) => {
                         error!("Error reading from MCP server {}: {}", name, e);
@@ -781,7 +791,7 @@ impl McpConnection {
 
     async fn send_request(&mut self, request: McpRequest) -> Result<McpResponse> {
         let id = request.id.clone().unwrap();
-        let request_json = serde_json::to_string(&request)?;
+        let mut request_json = serde_json::to_string(&request)?;
 
         debug!("Sending MCP request to {}: {}", self.name, request_json);
 
@@ -791,8 +801,10 @@ impl McpConnection {
 
         // Send request
         if let Some(writer) = &mut self.writer {
+            // Append the line delimiter before writing so the whole frame
+            // goes out in one write instead of two
+            request_json.push('\n');
             writer.write_all(request_json.as_bytes()).await?;
-            writer.write_all(b"\n").await?;
             writer.flush().await?;
         } else if let Some(websocket) = &mut self.websocket {
             websocket.send(Message::Text(request_json)).await?;
@@ -813,7 +825,7 @@ impl McpConnection {
     }
 
     async fn send_notification(&mut self, notification: McpRequest) -> Result<()> {
-        let notification_json = serde_json::to_string(&notification)?;
+        let mut notification_json = serde_json::to_string(&notification)?;
 
         debug!(
             "Sending MCP notification to {}: {}",
@@ -821,8 +833,9 @@ impl McpConnection {
         );
 
         if let Some(writer) = &mut self.writer {
+            // Same single-write framing as send_request
+            notification_json.push('\n');
             writer.write_all(notification_json.as_bytes()).await?;
-            writer.write_all(b"\n").await?;
             writer.flush().await?;
         } else if let Some(websocket) = &mut self.websocket {
             websocket.send(Message::Text(notification_json)).await?;
@@ -1110,36 +1123,51 @@ impl McpManager {
         info!("🌐 Connecting to all enabled MCP servers...");
         info!("   Total servers configured: {}", config.servers.len());
 
+        let mut enabled_servers = Vec::new();
         for (name, server_config) in config.servers.iter() {
             if server_config.enabled {
+                enabled_servers.push(name.clone());
+            } else {
+                info!("⏭️  Skipping disabled server: {}", name);
+            }
+        }
+        let total_servers = config.servers.len();
+        drop(config);
+
+        // Connect to every enabled server concurrently. Each connection is
+        // dominated by process spawn / handshake latency, so total startup
+        // time becomes roughly the slowest server instead of the sum of all.
+        let connect_results = futures_util::future::join_all(enabled_servers.iter().map(|name| {
+            async move {
                 info!("   Attempting to connect to: {}", name);
 
                 // Add timeout for individual server connections
-                let connect_result = tokio::time::timeout(
+                tokio::time::timeout(
                     std::time::Duration::from_secs(10), // 10 second timeout per server
                     self.connect_server(name),
                 )
-                .await;
+                .await
+            }
+        }))
+        .await;
 
-                match connect_result {
-                    Ok(Ok(_)) => {
-                        connected_count += 1;
-                        info!("✅ Connected to MCP server: {}", name);
-                    }
-                    Ok(Err(e)) => {
-                        failed_count += 1;
-                        warn!("❌ Failed to connect to MCP server '{}': {}", name, e);
-                    }
-                    Err(_) => {
-                        failed_count += 1;
-                        warn!(
-                            "⏰ MCP server '{}' connection timed out after 10 seconds",
-                            name
-                        );
-                    }
+        for (name, connect_result) in enabled_servers.iter().zip(connect_results) {
+            match connect_result {
+                Ok(Ok(_)) => {
+                    connected_count += 1;
+                    info!("✅ Connected to MCP server: {}", name);
+                }
+                Ok(Err(e)) => {
+                    failed_count += 1;
+                    warn!("❌ Failed to connect to MCP server '{}': {}", name, e);
+                }
+                Err(_) => {
+                    failed_count += 1;
+                    warn!(
+                        "⏰ MCP server '{}' connection timed out after 10 seconds",
+                        name
+                    );
                 }
-            } else {
-                info!("⏭️  Skipping disabled server: {}", name);
             }
         }
 
@@ -1148,7 +1176,7 @@ impl McpManager {
         info!("   Failed connections: {}", failed_count);
         info!(
             "   Skipped (disabled): {}",
-            config.servers.len() - connected_count - failed_count
+            total_servers - connected_count - failed_count
         );
 
         if connected_count > 0 {
@@ -3,8 +3,7 @@ use crate::tools::types::{Tool, ToolCall, ToolResult};
 use anyhow::Result;
 use log::{debug, info};
 use serde_json::json;
-use std::process::Command;
-use tokio::task;
+use tokio::process::Command;
 
 // Convert Unix command separators to Windows PowerShell equivalents
 // This function properly handles quoted strings, escape sequences, and complex command structures
@@ -156,33 +155,30 @@ pub async fn bash(
         command.clone()
     };
 
-    // Execute the command using tokio::task to spawn blocking operation
-    let command_clone = processed_command.clone();
-    match task::spawn_blocking(move || {
+    // Execute the command with tokio's async process API. output() completes
+    // on the runtime when the child exits, instead of parking a blocking-pool
+    // thread for the whole duration of the command.
+    let command_result = {
         #[cfg(target_os = "windows")]
         {
-            // Use PowerShell for better command handling on Windows
-            // For multiple commands, we need to use -Command with proper PowerShell syntax
-            let mut cmd = Command::new("powershell");
-
-            // If the command contains semicolons, it's likely multiple commands
-            if command_clone.contains(';') {
-                cmd.args(["-Command", &command_clone]);
-            } else {
-                // For single commands, we can use -Command as well for consistency
-                cmd.args(["-Command", &command_clone]);
-            }
-
-            cmd.output()
+            // Use PowerShell for better command handling on Windows; -Command
+            // handles both single commands and ;-separated sequences
+            Command::new("powershell")
+                .args(["-Command", &processed_command])
+                .output()
+                .await
         }
         #[cfg(not(target_os = "windows"))]
         {
-            Command::new("bash").args(["-c", &command_clone]).output()
+            Command::new("bash")
+                .args(["-c", &processed_command])
+                .output()
+                .await
         }
-    })
-    .await
-    {
-        Ok(Ok(output)) => {
+    };
+
+    match command_result {
+        Ok(output) => {
             let stdout = String::from_utf8_lossy(&output.stdout);
             let stderr = String::from_utf8_lossy(&output.stderr);
 
@@ -214,14 +210,9 @@ pub async fn bash(
                 is_error: !output.status.success(),
             })
         }
-        Ok(Err(e)) => Ok(ToolResult {
-            tool_use_id,
-            content: format!("Error executing command '{}': {}", command, e),
-            is_error: true,
-        }),
         Err(e) => Ok(ToolResult {
             tool_use_id,
-            content: format!("Task join error: {}", e),
+            content: format!("Error executing command '{}': {}", command, e),
             is_error: true,
         }),
     }
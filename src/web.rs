@@ -422,30 +422,36 @@ async fn list_conversations(State(state): State<WebState>) -> impl IntoResponse
 
     match result {
         Ok(conversations) => {
-            let mut items = Vec::new();
-            for conversation in conversations {
-                let messages = db
-                    .get_conversation_messages(&conversation.id)
-                    .await
-                    .unwrap_or_default();
-                let first_user = messages
-                    .iter()
-                    .find(|m| m.role == "user")
-                    .map(|m| m.content.clone());
-                let last_message = first_user.or_else(|| messages.last().map(|m| m.content.clone()));
-                let item = ConversationListItem {
-                    id: conversation.id.clone(),
-                    created_at: conversation.created_at.to_rfc3339(),
-                    updated_at: conversation.updated_at.to_rfc3339(),
-                    model: conversation.model.clone(),
-                    subagent: conversation.subagent.clone(),
-                    total_tokens: conversation.total_tokens,
-                    request_count: conversation.request_count,
-                    last_message,
-                    message_count: messages.len(),
-                };
-                items.push(item);
-            }
+            // Load each conversation's messages concurrently; awaiting the
+            // queries one at a time serialized a round-trip per conversation
+            let items =
+                futures_util::future::join_all(conversations.into_iter().map(|conversation| {
+                    let db = db.clone();
+                    async move {
+                        let messages = db
+                            .get_conversation_messages(&conversation.id)
+                            .await
+                            .unwrap_or_default();
+                        let first_user = messages
+                            .iter()
+                            .find(|m| m.role == "user")
+                            .map(|m| m.content.clone());
+                        let last_message =
+                            first_user.or_else(|| messages.last().map(|m| m.content.clone()));
+                        ConversationListItem {
+                            id: conversation.id.clone(),
+                            created_at: conversation.created_at.to_rfc3339(),
+                            updated_at: conversation.updated_at.to_rfc3339(),
+                            model: conversation.model.clone(),
+                            subagent: conversation.subagent.clone(),
+                            total_tokens: conversation.total_tokens,
+                            request_count: conversation.request_count,
+                            last_message,
+                            message_count: messages.len(),
+                        }
+                    }
+                }))
+                .await;
             Json(items).into_response()
         }
         Err(e) => {
@@ -492,13 +498,17 @@ async fn get_conversation(
 
             let mut meta = conversation_to_meta(&conversation);
 
+            // Fetch the stored messages once; both the timeline and the
+            // context-file extraction below read from the same result
+            let raw_messages = db.get_conversation_messages(&id).await;
+
             let messages: Vec<MessageDto> = if use_snapshot {
                 meta.system_prompt = snapshot.system_prompt.clone();
                 meta.model = snapshot.model.clone();
                 snapshot_messages_to_dto(&snapshot)
             } else {
-                let raw_messages = match db.get_conversation_messages(&id).await {
-                    Ok(messages) => messages,
+                let raw_messages = match &raw_messages {
+                    Ok(messages) => messages.clone(),
                     Err(e) => {
                         return (
                             StatusCode::INTERNAL_SERVER_ERROR,
@@ -517,10 +527,10 @@ async fn get_conversation(
                             .into_response()
                     }
                 };
-                timeline_messages_to_dto(raw_messages.clone(), tool_calls)
+                timeline_messages_to_dto(raw_messages, tool_calls)
             };
 
-            let raw_context_messages: Vec<MessageDto> = match db.get_conversation_messages(&id).await {
+            let raw_context_messages: Vec<MessageDto> = match raw_messages {
                 Ok(msgs) => msgs
                     .into_iter()
                     .map(|m| {